@@ -68,7 +68,10 @@ class ProcessNode(object):
         process = Popen(
             self.initial_command_arguments +
             tuple(map(self._quote, remote_command)),
-            stdin=PIPE)
+            # Fully buffer the pipe to the child so a caller issuing many
+            # small writes (e.g. streaming a volume) doesn't pay one write
+            # syscall per call.  Closing stdin below flushes the buffer.
+            stdin=PIPE, bufsize=-1)
         try:
             yield process.stdin
         finally:
@@ -111,7 +114,13 @@ class ProcessNode(object):
             # a concern.
             b"-o", b"StrictHostKeyChecking=no",
             # The tests hang if ControlMaster is set, since OpenSSH won't
-            # ever close the connection to the test server.
+            # ever close the connection to the test server; ControlPersist
+            # doesn't help because the lingering master still holds its
+            # connection open when trial checks the reactor for leftover
+            # selectables.  A fixed ControlPath under /tmp would also be
+            # squattable by other local users, so multiplexing would need a
+            # private mode-0700 socket directory before it could be turned
+            # on safely.
             b"-oControlMaster=no",
             # On some Ubuntu versions (and perhaps elsewhere) not
             # disabling this leads for mDNS lookups on every SSH, which
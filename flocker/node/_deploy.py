@@ -448,14 +448,17 @@ class Deployer(object):
                     HandoffVolume(volume=handoff.volume,
                                   hostname=handoff.hostname)
                     for handoff in volumes.going]))
-            if volumes.coming:
-                phases.append(InParallel(changes=[
-                    WaitForVolume(volume=volume)
-                    for volume in volumes.coming]))
-            if volumes.creating:
-                phases.append(InParallel(changes=[
-                    CreateVolume(volume=volume)
-                    for volume in volumes.creating]))
+            # Waiting for volumes handed off by other nodes and creating
+            # brand new volumes are independent of each other, so they can
+            # all run in a single parallel batch.
+            volume_changes = [
+                WaitForVolume(volume=volume)
+                for volume in volumes.coming]
+            volume_changes.extend(
+                CreateVolume(volume=volume)
+                for volume in volumes.creating)
+            if volume_changes:
+                phases.append(InParallel(changes=volume_changes))
             start_restart = start_containers + restart_containers
             if start_restart:
                 phases.append(InParallel(changes=start_restart))
@@ -483,7 +486,15 @@ class Deployer(object):
             desired_state=desired_state,
             current_cluster_state=current_cluster_state,
             hostname=hostname)
-        d.addCallback(lambda change: change.run(self))
+
+        def run_if_necessary(change):
+            # Convergence frequently discovers the node is already in the
+            # desired state.  Skip running the change in that case rather
+            # than churning through a series of no-op callbacks.
+            if change == Sequentially(changes=[]):
+                return None
+            return change.run(self)
+        d.addCallback(run_if_necessary)
         return d
 
 
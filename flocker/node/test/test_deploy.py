@@ -1169,6 +1169,66 @@ class DeployerCalculateNecessaryStateChangesTests(SynchronousTestCase):
         ])
         self.assertEqual(expected, changes)
 
+    def test_volume_wait_and_create_in_parallel(self):
+        """
+        ``Deployer.calculate_necessary_state_changes`` puts waiting for
+        handed-off volumes and creating brand new volumes into a single
+        parallel phase since the two kinds of work are independent.
+        """
+        # Neither application is running here yet.
+        docker = FakeDockerClient(units={})
+
+        new_application = Application(
+            name=u'mysql-hybridcluster',
+            image=DockerImage(repository=u'clusterhq/mysql', tag=u'latest'),
+            volume=AttachedVolume(name=u'mysql-hybridcluster',
+                                  mountpoint=b'/var/lib/mysql'),
+            links=frozenset(),
+        )
+
+        node = Node(
+            hostname=u"node1.example.com",
+            applications=frozenset(),
+        )
+        another_node = Node(
+            hostname=u"node2.example.com",
+            applications=frozenset({DISCOVERED_APPLICATION_WITH_VOLUME}),
+        )
+
+        # The discovered current configuration of the cluster reveals one
+        # application running somewhere else and the other nowhere at all.
+        current = Deployment(nodes=frozenset([node, another_node]))
+
+        api = Deployer(
+            create_volume_service(self), docker_client=docker,
+            network=make_memory_network()
+        )
+
+        desired = Deployment(nodes=frozenset({
+            Node(hostname=node.hostname,
+                 applications=frozenset({APPLICATION_WITH_VOLUME,
+                                         new_application})),
+            Node(hostname=another_node.hostname,
+                 applications=frozenset()),
+        }))
+
+        calculating = api.calculate_necessary_state_changes(
+            desired_state=desired,
+            current_cluster_state=current,
+            hostname=node.hostname,
+        )
+
+        changes = self.successResultOf(calculating)
+
+        volume = AttachedVolume(
+            name=APPLICATION_WITH_VOLUME_NAME,
+            mountpoint=APPLICATION_WITH_VOLUME_MOUNTPOINT,
+        )
+        expected_volume_phase = InParallel(changes=[
+            WaitForVolume(volume=volume),
+            CreateVolume(volume=new_application.volume)])
+        self.assertEqual(expected_volume_phase, changes.changes[0])
+
     def test_no_volume_changes(self):
         """
         ``Deployer.calculate_necessary_state_changes`` specifies no work for
@@ -1375,38 +1435,39 @@ class SetProxiesTests(SynchronousTestCase):
     """
     Tests for ``SetProxies``.
     """
-    def test_proxies_added(self):
+    def setUp(self):
         """
-        Proxies which are required are added.
+        Every test uses the same deployer configuration, so build the
+        fixtures once here instead of once per test body.
         """
-        fake_network = make_memory_network()
-        api = Deployer(
+        self.network = make_memory_network()
+        self.api = Deployer(
             create_volume_service(self), docker_client=FakeDockerClient(),
-            network=fake_network)
+            network=self.network)
 
+    def test_proxies_added(self):
+        """
+        Proxies which are required are added.
+        """
         expected_proxy = Proxy(ip=u'192.0.2.100', port=3306)
-        d = SetProxies(ports=[expected_proxy]).run(api)
+        d = SetProxies(ports=[expected_proxy]).run(self.api)
         self.successResultOf(d)
         self.assertEqual(
             [expected_proxy],
-            fake_network.enumerate_proxies()
+            self.network.enumerate_proxies()
         )
 
     def test_proxies_removed(self):
         """
         Proxies which are no longer required on the node are removed.
         """
-        fake_network = make_memory_network()
-        fake_network.create_proxy_to(ip=u'192.0.2.100', port=3306)
-        api = Deployer(
-            create_volume_service(self), docker_client=FakeDockerClient(),
-            network=fake_network)
+        self.network.create_proxy_to(ip=u'192.0.2.100', port=3306)
 
-        d = SetProxies(ports=[]).run(api)
+        d = SetProxies(ports=[]).run(self.api)
         self.successResultOf(d)
         self.assertEqual(
             [],
-            fake_network.enumerate_proxies()
+            self.network.enumerate_proxies()
         )
 
     def test_desired_proxies_remain(self):
@@ -1414,26 +1475,20 @@ class SetProxiesTests(SynchronousTestCase):
         Proxies which exist on the node and which are still required are not
         removed.
         """
-        fake_network = make_memory_network()
-
         # A proxy which will be removed
-        fake_network.create_proxy_to(ip=u'192.0.2.100', port=3306)
+        self.network.create_proxy_to(ip=u'192.0.2.100', port=3306)
         # And some proxies which are still required
-        required_proxy1 = fake_network.create_proxy_to(ip=u'192.0.2.101',
+        required_proxy1 = self.network.create_proxy_to(ip=u'192.0.2.101',
                                                        port=3306)
-        required_proxy2 = fake_network.create_proxy_to(ip=u'192.0.2.101',
+        required_proxy2 = self.network.create_proxy_to(ip=u'192.0.2.101',
                                                        port=8080)
 
-        api = Deployer(
-            create_volume_service(self), docker_client=FakeDockerClient(),
-            network=fake_network)
-
-        d = SetProxies(ports=[required_proxy1, required_proxy2]).run(api)
+        d = SetProxies(ports=[required_proxy1, required_proxy2]).run(self.api)
 
         self.successResultOf(d)
         self.assertEqual(
             set([required_proxy1, required_proxy2]),
-            set(fake_network.enumerate_proxies())
+            set(self.network.enumerate_proxies())
         )
 
     def test_delete_proxy_errors_as_errbacks(self):
@@ -1441,15 +1496,10 @@ class SetProxiesTests(SynchronousTestCase):
         Exceptions raised in `delete_proxy` operations are reported as
         failures in the returned deferred.
         """
-        fake_network = make_memory_network()
-        fake_network.create_proxy_to(ip=u'192.0.2.100', port=3306)
-        fake_network.delete_proxy = lambda proxy: 1/0
+        self.network.create_proxy_to(ip=u'192.0.2.100', port=3306)
+        self.network.delete_proxy = lambda proxy: 1/0
 
-        api = Deployer(
-            create_volume_service(self), docker_client=FakeDockerClient(),
-            network=fake_network)
-
-        d = SetProxies(ports=[]).run(api)
+        d = SetProxies(ports=[]).run(self.api)
         exception = self.failureResultOf(d, FirstError)
         self.assertIsInstance(
             exception.value.subFailure.value,
@@ -1462,14 +1512,10 @@ class SetProxiesTests(SynchronousTestCase):
         Exceptions raised in `create_proxy_to` operations are reported as
         failures in the returned deferred.
         """
-        fake_network = make_memory_network()
-        fake_network.create_proxy_to = lambda ip, port: 1/0
+        self.network.create_proxy_to = lambda ip, port: 1/0
 
-        api = Deployer(
-            create_volume_service(self), docker_client=FakeDockerClient(),
-            network=fake_network)
-
-        d = SetProxies(ports=[Proxy(ip=u'192.0.2.100', port=3306)]).run(api)
+        d = SetProxies(ports=[Proxy(ip=u'192.0.2.100', port=3306)]).run(
+            self.api)
         exception = self.failureResultOf(d, FirstError)
         self.assertIsInstance(
             exception.value.subFailure.value,
@@ -1481,18 +1527,13 @@ class SetProxiesTests(SynchronousTestCase):
         """
         Exceptions raised in `create_proxy_to` operations are all logged.
         """
-        fake_network = make_memory_network()
-        fake_network.create_proxy_to = lambda ip, port: 1/0
-
-        api = Deployer(
-            create_volume_service(self), docker_client=FakeDockerClient(),
-            network=fake_network)
+        self.network.create_proxy_to = lambda ip, port: 1/0
 
         d = SetProxies(
             ports=[Proxy(ip=u'192.0.2.100', port=3306),
                    Proxy(ip=u'192.0.2.101', port=3306),
                    Proxy(ip=u'192.0.2.102', port=3306)]
-        ).run(api)
+        ).run(self.api)
 
         self.failureResultOf(d, FirstError)
 
@@ -1509,6 +1550,12 @@ class DeployerChangeNodeStateTests(SynchronousTestCase):
     refactored to not be based on side-effects. See
     https://github.com/ClusterHQ/flocker/issues/321
     """
+    def setUp(self):
+        """
+        Every test needs a volume service, so create one once here.
+        """
+        self.volume_service = create_volume_service(self)
+
     def test_applications_stopped(self):
         """
         Existing applications which are not in the desired configuration are
@@ -1518,7 +1565,7 @@ class DeployerChangeNodeStateTests(SynchronousTestCase):
                     container_name=u'mysql-hybridcluster',
                     activation_state=u'active')
         fake_docker = FakeDockerClient(units={unit.name: unit})
-        api = Deployer(create_volume_service(self), docker_client=fake_docker,
+        api = Deployer(self.volume_service, docker_client=fake_docker,
                        network=make_memory_network())
         desired = Deployment(nodes=frozenset())
 
@@ -1535,7 +1582,7 @@ class DeployerChangeNodeStateTests(SynchronousTestCase):
         Applications which are in the desired configuration are started.
         """
         fake_docker = FakeDockerClient(units={})
-        api = Deployer(create_volume_service(self), docker_client=fake_docker,
+        api = Deployer(self.volume_service, docker_client=fake_docker,
                        network=make_memory_network())
         expected_application_name = u'mysql-hybridcluster'
         application = Application(
@@ -1569,7 +1616,7 @@ class DeployerChangeNodeStateTests(SynchronousTestCase):
         ``run()`` on the result of ``calculate_necessary_state_changes``.
         """
         deferred = Deferred()
-        api = Deployer(create_volume_service(self),
+        api = Deployer(self.volume_service,
                        docker_client=FakeDockerClient(),
                        network=make_memory_network())
         self.patch(api, "calculate_necessary_state_changes",
@@ -1586,7 +1633,7 @@ class DeployerChangeNodeStateTests(SynchronousTestCase):
         deployer.
         """
         change = FakeChange(succeed(None))
-        api = Deployer(create_volume_service(self),
+        api = Deployer(self.volume_service,
                        docker_client=FakeDockerClient(),
                        network=make_memory_network())
         self.patch(api, "calculate_necessary_state_changes",
@@ -1596,6 +1643,24 @@ class DeployerChangeNodeStateTests(SynchronousTestCase):
                               hostname=u'node.example.com')
         self.assertIs(change.deployer, api)
 
+    def test_no_changes_not_run(self):
+        """
+        If ``calculate_necessary_state_changes`` determines that no changes
+        are necessary then the resulting no-op change is not run.
+        """
+        api = Deployer(self.volume_service,
+                       docker_client=FakeDockerClient(),
+                       network=make_memory_network())
+        self.patch(api, "calculate_necessary_state_changes",
+                   lambda *args, **kwargs: succeed(Sequentially(changes=[])))
+        ran = []
+        self.patch(Sequentially, "run", lambda change, deployer: ran.append(
+            deployer))
+        result = api.change_node_state(desired_state=EMPTY,
+                                       current_cluster_state=EMPTY,
+                                       hostname=u'node.example.com')
+        self.assertEqual((self.successResultOf(result), ran), (None, []))
+
     def test_arguments(self):
         """
         The passed in arguments are passed on in turn to
@@ -1604,7 +1669,7 @@ class DeployerChangeNodeStateTests(SynchronousTestCase):
         desired = object()
         state = object()
         host = object()
-        api = Deployer(create_volume_service(self),
+        api = Deployer(self.volume_service,
                        docker_client=FakeDockerClient(),
                        network=make_memory_network())
         arguments = []
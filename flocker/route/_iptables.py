@@ -8,14 +8,15 @@ Manipulate network routing behavior on a node using ``iptables``.
 from __future__ import unicode_literals
 
 import shlex
-from subprocess import check_call, check_output
+from collections import namedtuple
+from subprocess import PIPE, CalledProcessError, Popen, check_call, \
+    check_output
 
 from zope.interface import implementer
 from ipaddr import IPAddress
-from characteristic import attributes
 from eliot import Logger
-from psutil import net_connections
 from twisted.python.filepath import FilePath
+from twisted.python.procutils import which
 
 from ._logging import CREATE_PROXY_TO, DELETE_PROXY, IPTABLES
 from ._interfaces import INetwork
@@ -23,18 +24,50 @@ from ._model import Proxy
 
 FLOCKER_COMMENT_MARKER = b"flocker create_proxy_to"
 
+# The iptables arguments which tag a rule as flocker-created.  Built once
+# here instead of being re-assembled for every rule operation.
+COMMENT_ARGUMENTS = [
+    b"--match", b"comment", b"--comment", FLOCKER_COMMENT_MARKER,
+]
 
-@attributes(["comment", "destination_port", "to_destination"])
-class RuleOptions(object):
+
+def _resolve_binary(name):
+    """
+    Find the full path to the named binary at import time, so executing it
+    later doesn't repeat the ``PATH`` search on every invocation.
+
+    :param bytes name: The name of the binary.
+
+    :return: The full path as ``bytes``, or the bare name if it isn't
+        currently on ``PATH`` (leaving the search to ``exec``).
+    """
+    found = which(name)
+    if found:
+        return found[0]
+    return name
+
+
+IPTABLES_BINARY = _resolve_binary(b"iptables")
+IPTABLES_RESTORE_BINARY = _resolve_binary(b"iptables-restore")
+IPTABLES_SAVE_BINARY = _resolve_binary(b"iptables-save")
+
+
+class RuleOptions(namedtuple(
+        "RuleOptions", ["comment", "destination_port", "to_destination"])):
     """
     :ivar bytes comment: The value of the ``comment`` *match* for this rule.
 
     :ivar int destination_port: The value of the ``destination-port`` option
         for the ``tcp`` *match* for this rule.
 
-    :ivar IPv4Address to_destination: The value of the ``to-destination``
-        option for the ``DNAT`` *target* for this rule.
+    :ivar bytes to_destination: The value of the ``to-destination`` option
+        for the ``DNAT`` *target* for this rule.  Left as the raw bytes;
+        consumers which want an ``IPAddress`` construct one themselves so
+        the cost is only paid for rules which are actually used.
     """
+    # One of these is created for every rule parsed out of the NAT table,
+    # so keep the namedtuple's lack of a per-instance ``__dict__``.
+    __slots__ = ()
 
 
 def iptables(logger, argv):
@@ -45,7 +78,46 @@ def iptables(logger, argv):
         iptables is prepended to this list for execution.
     """
     with IPTABLES(logger=logger, argv=argv):
-        check_call([b"iptables"] + argv)
+        # iptables inherits no interesting file descriptors, so spare the
+        # subprocess module the cost of walking and closing the whole
+        # descriptor table for every invocation.
+        check_call([IPTABLES_BINARY] + argv, close_fds=False)
+
+
+def _quote(argument):
+    """
+    Quote a rule argument for inclusion in an ``iptables-restore`` line.
+
+    :param bytes argument: A single iptables option or option value.
+
+    :return: The argument as ``bytes``, quoted if it contains whitespace.
+    """
+    if b" " in argument:
+        return b'"' + argument + b'"'
+    return argument
+
+
+def iptables_restore(logger, rules):
+    """
+    Program a batch of NAT table rules with a single ``iptables-restore``
+    invocation.
+
+    :param list rules: A ``list`` of iptables argv-style rule specifications,
+        each a ``list`` of ``bytes`` beginning with ``b"--append"`` or
+        ``b"--delete"`` and a chain name.  The table option must not be
+        included; all of the rules are applied to the NAT table.
+    """
+    argv = [IPTABLES_RESTORE_BINARY, b"--noflush"]
+    table = b"\n".join(
+        [b"*nat"] +
+        [b" ".join(_quote(argument) for argument in rule)
+         for rule in rules] +
+        [b"COMMIT", b""])
+    with IPTABLES(logger=logger, argv=argv):
+        process = Popen(argv, stdin=PIPE, close_fds=False)
+        process.communicate(table)
+        if process.returncode != 0:
+            raise CalledProcessError(process.returncode, argv)
 
 
 def create_proxy_to(logger, ip, port):
@@ -64,10 +136,7 @@ def create_proxy_to(logger, ip, port):
         # specified port so it looks like it is destined for the specified ip
         # instead of destined for "us".  This gets the packets delivered to the
         # right destination.
-        iptables(logger, [
-            # All NAT stuff happens in the netfilter NAT table.
-            b"--table", b"nat",
-
+        prerouting = [
             # Destination NAT has to happen "pre"-routing so that the normal
             # routing rules on the machine will use the re-written destination
             # address and get the packet to that new destination.  Accomplish
@@ -86,7 +155,7 @@ def create_proxy_to(logger, ip, port):
             b"--match", b"addrtype", b"--dst-type", b"LOCAL",
 
             # Tag it as a flocker-created rule so we can recognize it later.
-            b"--match", b"comment", b"--comment", FLOCKER_COMMENT_MARKER,
+            ] + COMMENT_ARGUMENTS + [
 
             # If the filter matched, jump to the DNAT chain to handle doing the
             # actual packet mangling.  DNAT is a built-in chain that already
@@ -94,7 +163,7 @@ def create_proxy_to(logger, ip, port):
             # knows how to mangle the packet - rewrite the destination IP of
             # the address to the target we were told to use.
             b"--jump", b"DNAT", b"--to-destination", encoded_ip,
-        ])
+        ]
 
         # Bonus round!  Having performed DNAT (changing the destination) during
         # prerouting we are now prepared to send the packet on somewhere else.
@@ -112,10 +181,7 @@ def create_proxy_to(logger, ip, port):
         # if it ever changes the rule gets updated and it may require some
         # steps to do port allocation (not sure what they are yet).  So we'll
         # just masquerade for now.
-        iptables(logger, [
-            # All NAT stuff happens in the netfilter NAT table.
-            b"--table", b"nat",
-
+        postrouting = [
             # As described above, this transformation happens after routing
             # decisions have been made and the packet is on its way out of the
             # system.  Therefore, append the rule to the POSTROUTING chain.
@@ -132,17 +198,14 @@ def create_proxy_to(logger, ip, port):
 
             # Do the masquerading.
             b"--jump", b"MASQUERADE",
-        ])
+        ]
 
         # Secret level!!  Traffic that originates *on* the host bypasses the
         # PREROUTING chain.  Instead, it passes through the OUTPUT chain.  If
         # we want connections from localhost to the forwarded port to be
         # affected then we need a rule in the OUTPUT chain to do the same kind
         # of DNAT that we did in the PREROUTING chain.
-        iptables(logger, [
-            # All NAT stuff happens in the netfilter NAT table.
-            b"--table", b"nat",
-
+        output = [
             # As mentioned, this rule is for the OUTPUT chain.
             b"--append", b"OUTPUT",
 
@@ -154,7 +217,12 @@ def create_proxy_to(logger, ip, port):
 
             # Do the same DNAT as we did in the rule for the PREROUTING chain.
             b"--jump", b"DNAT", b"--to-destination", encoded_ip,
-        ])
+        ]
+
+        # Program all three rules with a single iptables-restore invocation
+        # instead of paying for three separate iptables round-trips (each of
+        # which takes the netfilter table lock and reloads the whole table).
+        iptables_restore(logger, [prerouting, postrouting, output])
 
         # The network stack only considers forwarding traffic when certain
         # system configuration is in place.
@@ -183,27 +251,46 @@ def delete_proxy(logger, proxy):
     ip = unicode(proxy.ip).encode("ascii")
     port = unicode(proxy.port).encode("ascii")
 
-    commands = [
-        [b"--table", b"nat",
-         b"--delete", b"PREROUTING",
+    rules = [
+        [b"--delete", b"PREROUTING",
          b"--protocol", b"tcp", b"--destination-port", port,
-         b"--match", b"addrtype", b"--dst-type", b"LOCAL",
-         b"--match", b"comment", b"--comment", FLOCKER_COMMENT_MARKER,
-         b"--jump", b"DNAT", b"--to-destination", ip],
-        [b"--table", b"nat",
-         b"--delete", b"POSTROUTING",
+         b"--match", b"addrtype", b"--dst-type", b"LOCAL"]
+        + COMMENT_ARGUMENTS +
+        [b"--jump", b"DNAT", b"--to-destination", ip],
+        [b"--delete", b"POSTROUTING",
          b"--protocol", b"tcp", b"--destination-port", port,
          b"--jump", b"MASQUERADE"],
-        [b"--table", b"nat",
-         b"--delete", b"OUTPUT",
+        [b"--delete", b"OUTPUT",
          b"--protocol", b"tcp", b"--destination-port", port,
          b"--match", b"addrtype", b"--dst-type", b"LOCAL",
          b"--jump", b"DNAT", b"--to-destination", ip],
     ]
 
     with DELETE_PROXY(logger, target_ip=proxy.ip, target_port=proxy.port):
-        for argv in commands:
-            iptables(logger, argv)
+        iptables_restore(logger, rules)
+
+
+# Previously seen proxies, indexed by their address and port.  Enumeration
+# reports the same proxies over and over, so share one ``Proxy`` instance
+# per (ip, port) pair instead of allocating duplicates on every call.
+_proxy_cache = {}
+
+
+def _intern_proxy(ip, port):
+    """
+    Return a shared ``Proxy`` instance for the given target.
+
+    :param bytes ip: The target IP of the proxy, as found in the rule.
+    :param int port: The TCP port number on which the proxy operates.
+
+    :return: A ``Proxy`` equal to any previously returned for the same
+        arguments.
+    """
+    key = (ip, port)
+    proxy = _proxy_cache.get(key)
+    if proxy is None:
+        proxy = _proxy_cache[key] = Proxy(ip=IPAddress(ip), port=port)
+    return proxy
 
 
 def enumerate_proxies():
@@ -213,26 +300,68 @@ def enumerate_proxies():
 
     :see: :py:meth:`INetwork.enumerate_proxies` for parameter documentation.
     """
-    proxies = []
-    for rule in get_flocker_rules():
-        proxies.append(
-            Proxy(ip=rule.to_destination, port=rule.destination_port))
+    # The ``INetwork`` contract is to return a list, but the underlying rule
+    # parsing is lazy so build the list in a single pass over it.
+    return [
+        _intern_proxy(rule.to_destination, rule.destination_port)
+        for rule in get_flocker_rules()]
+
 
-    return proxies
+# The fingerprint of the most recent ``iptables-save`` output and the rules
+# parsed from it.  If the fingerprint is unchanged since the last look-up
+# then the rule table has not changed either and the previous parse can be
+# re-used without decoding anything.
+_rule_cache = [None, None]
+
+
+def _rule_fingerprint(output):
+    """
+    Reduce ``iptables-save`` output to just the parts that reflect the
+    actual rule configuration.
+
+    The output also contains ``#`` comment lines carrying timestamps and
+    ``:`` chain lines carrying packet counters, both of which change even
+    when no rule does.  Comparing raw output against those would defeat the
+    cache, so strip them.
+
+    :param bytes output: The output of ``iptables-save --table nat``.
+
+    :return: ``bytes`` which are equal for any two outputs describing the
+        same rules.
+    """
+    return b"\n".join(
+        line for line in output.splitlines()
+        if not line.startswith((b"#", b":")))
 
 
 def get_flocker_rules():
     """
     Look up all of the iptables rules created/managed by flocker.
 
-    :return: An iterator of :py:class:`Options` instances, one for each rule
-        found.
+    :return: A :py:class:`list` of :py:class:`RuleOptions` instances, one for
+        each rule found.
     """
     # Life is horrible.
     # https://stackoverflow.com/questions/109553/how-can-i-programmatically-manage-iptables-rules-on-the-fly
     # At least we know all the rules we need to inspect are in the NAT table.
-    output = check_output([b"iptables-save", b"--table", b"nat"])
+    output = check_output([IPTABLES_SAVE_BINARY, b"--table", b"nat"])
+
+    fingerprint = _rule_fingerprint(output)
+    if fingerprint != _rule_cache[0]:
+        _rule_cache[0] = fingerprint
+        _rule_cache[1] = list(_parse_flocker_rules(output))
+    return _rule_cache[1]
+
 
+def _parse_flocker_rules(output):
+    """
+    Parse the flocker-created rules out of ``iptables-save`` output.
+
+    :param bytes output: The output of ``iptables-save --table nat``.
+
+    :return: An iterator of :py:class:`RuleOptions` instances, one for each
+        rule found.
+    """
     # Find the beginning of the NAT table
     header = b"*nat\n"
     begin = output.find(header) + len(header)
@@ -245,8 +374,17 @@ def get_flocker_rules():
     nat = output[begin:end]
 
     for line in nat.splitlines():
-        if line.startswith(b":"):
-            # Skip these lines describing a chain or the table overall.
+        # The flocker comment is only ever attached to the PREROUTING rule
+        # of a proxy, so rules in any other chain (and the lines describing
+        # the chains themselves) are rejected on the prefix alone.
+        if not line.startswith(b"-A PREROUTING "):
+            continue
+
+        # Skip any remaining rule which cannot possibly be one of ours.  A
+        # substring check is much cheaper than tokenizing the line with
+        # ``shlex`` so on a system with a large NAT table almost all of the
+        # lines are rejected without paying the tokenization cost.
+        if FLOCKER_COMMENT_MARKER not in line:
             continue
 
         options = parse_iptables_options(shlex.split(line))
@@ -287,7 +425,7 @@ def parse_iptables_options(argv):
         destination_port = int(argv[destination_port_index + 1])
 
         to_destination_index = argv.index(b"--to-destination")
-        to_destination = IPAddress(argv[to_destination_index + 1])
+        to_destination = argv[to_destination_index + 1]
 
         # Find the comment last so that the other two attributes always have a
         # value if the comment has a value.
@@ -302,6 +440,33 @@ def parse_iptables_options(argv):
         to_destination=to_destination)
 
 
+def _enumerate_tcp_ports():
+    """
+    Find the local port number of every TCP socket known to the kernel.
+
+    This reads the kernel's own connection tables instead of asking psutil,
+    which walks every process under ``/proc`` to attribute sockets to their
+    owners - information we don't need.
+
+    :return: A :py:class:`set` of ``int`` port numbers.
+    """
+    ports = set()
+    for path in [b"/proc/net/tcp", b"/proc/net/tcp6"]:
+        try:
+            with open(path) as connections:
+                # Skip the column headers.
+                next(connections)
+                for line in connections:
+                    # The second field is the hex-encoded local address,
+                    # e.g. 0100007F:1F90.
+                    local_address = line.split(None, 2)[1]
+                    ports.add(int(local_address.rsplit(b":", 1)[1], 16))
+        except IOError:
+            # The host may not have IPv6 support.
+            continue
+    return ports
+
+
 @implementer(INetwork)
 class HostNetwork(object):
     """
@@ -335,16 +500,12 @@ class HostNetwork(object):
         :see: :meth:`INetwork.enumerate_used_ports` for parameter
             documentation.
         """
-        listening = set(
-            conn.laddr[1]
-            for conn
-            in net_connections(kind='tcp')
-        )
+        listening = _enumerate_tcp_ports()
         proxied = set(
             proxy.port
             for proxy in self.enumerate_proxies()
         )
-        # net_connections won't tell us about ports bound by sockets that
+        # /proc/net/tcp won't tell us about ports bound by sockets that
         # haven't entered the TCP state graph yet.
         return frozenset(listening | proxied)
 
@@ -15,3 +15,6 @@ class Proxy(object):
 
     :ivar int port: The TCP port number on which this proxy operates.
     """
+    # Enumerating the proxies on a busy node materializes many of these at
+    # once, so skip the per-instance ``__dict__``.
+    __slots__ = ("ip", "port")
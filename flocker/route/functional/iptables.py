@@ -4,30 +4,41 @@
 Testing tools related to iptables.
 """
 
+import re
 from subprocess import check_output, check_call
 from nomenclature.syscalls import unshare, setns, CLONE_NEWNET
 from ipaddr import IPAddress
 
+# Lines of iptables-save output to ignore:
+#
+# Comments don't matter.  They always differ because they include
+# timestamps.
+#
+# Chain data could matter but doesn't.  The implementation doesn't mess
+# with this stuff.  It typically differs in uninteresting ways - such as
+# matched packet counters.
+_IGNORED_RULE = re.compile(b"^[#:]")
 
-def get_iptables_rules():
+
+def get_iptables_rules(table=None):
     """
     Return a list of :command:`iptables-save`-formatted rule strings with
     comments and packet/byte counter lines removed.
 
     This also removes the information about the default policy for chains
     (which might someday be important).
+
+    :param bytes table: If given, only dump rules from this table (for
+        example ``b"nat"``) instead of all of them.
     """
-    rules = check_output([b"iptables-save"])
+    argv = [b"iptables-save"]
+    if table is not None:
+        argv.extend([b"--table", table])
+    rules = check_output(argv)
     return [
         rule
         for rule in rules.splitlines()
-        # Comments don't matter.  They always differ because they
-        # include timestamps.
-        if not rule.startswith("#")
-        # Chain data could matter but doesn't.  The implementation
-        # doesn't mess with this stuff.  It typically differs in
-        # uninteresting ways - such as matched packet counters.
-        and not rule.startswith(":")
+        if not _IGNORED_RULE.match(rule)
         ]
 
 
@@ -43,14 +54,32 @@ class _Namespace(object):
 
     def create(self):
         """
-        Create a new network namespace, and populate it with some addresses.
+        Create a new network namespace and populate it with some addresses,
+        then switch back to the namespace this was called from.
+
+        The created namespace is kept alive by an open descriptor so it can
+        be switched into later with :py:meth:`enter`.
+        """
+        original = open('/proc/self/ns/net')
+        try:
+            unshare(CLONE_NEWNET)
+            check_call(['ip', 'link', 'set', 'up', 'lo'])
+            check_call(['ip', 'link', 'add', 'eth0', 'type', 'dummy'])
+            check_call(['ip', 'link', 'set', 'eth0', 'up'])
+            check_call(['ip', 'addr', 'add', '10.0.0.1/8', 'dev', 'eth0'])
+            self._created = open('/proc/self/ns/net')
+        finally:
+            setns(original.fileno(), CLONE_NEWNET)
+            original.close()
+
+    def enter(self):
+        """
+        Switch into the namespace made by :py:meth:`create`, remembering the
+        current namespace so :py:meth:`restore` can switch back to it.
         """
         self.fd = open('/proc/self/ns/net')
-        unshare(CLONE_NEWNET)
-        check_call(['ip', 'link', 'set', 'up', 'lo'])
-        check_call(['ip', 'link', 'add', 'eth0', 'type', 'dummy'])
-        check_call(['ip', 'link', 'set', 'eth0', 'up'])
-        check_call(['ip', 'addr', 'add', '10.0.0.1/8', 'dev', 'eth0'])
+        setns(self._created.fileno(), CLONE_NEWNET)
+        self._created.close()
 
     def restore(self):
         """
@@ -60,13 +89,67 @@ class _Namespace(object):
         self.fd.close()
 
 
+class NamespacePool(object):
+    """
+    A pool of pre-created network namespaces.
+
+    The pool only creates namespaces ahead of time when explicitly warmed
+    with :py:meth:`fill`; acquiring from an empty pool creates exactly one
+    namespace, the same cost as having no pool at all.  Each namespace is
+    handed out at most once because the tests using them mutate the
+    iptables configuration of the namespace they run in.
+    """
+    def __init__(self):
+        self._free = []
+
+    def fill(self, count):
+        """
+        Create namespaces until ``count`` of them are available.
+
+        :param int count: The number of namespaces to have ready.
+        """
+        while len(self._free) < count:
+            namespace = _Namespace()
+            namespace.create()
+            self._free.append(namespace)
+
+    def acquire(self):
+        """
+        Enter a pre-created namespace, or a freshly created one if the
+        pool is empty.
+
+        :return: The :py:class:`_Namespace` which is now active.
+        """
+        if not self._free:
+            self.fill(1)
+        namespace = self._free.pop()
+        namespace.enter()
+        return namespace
+
+
+_POOL = NamespacePool()
+
+
+def warm_network_namespace_pool(count):
+    """
+    Pre-create network namespaces so that the next ``count`` calls to
+    :py:func:`create_network_namespace` don't have to create any.
+
+    :param int count: The number of namespaces to have ready.
+    """
+    _POOL.fill(count)
+
+
 def create_network_namespace():
     """
     :py:func:`create_network_namespace` is a fixture which creates a new
     network namespace, and restores the original one later.  Use the
     :py:meth:`restore`: method of the returned object to restore the orginal
     namespace.
+
+    The namespaces come from a shared pool; test cases which warm the pool
+    with :py:func:`warm_network_namespace_pool` first share the creation
+    cost across their setUps, and other callers pay for a single creation
+    as before.
     """
-    namespace = _Namespace()
-    namespace.create()
-    return namespace
+    return _POOL.acquire()
@@ -11,7 +11,7 @@ Twisted's event loop (https://github.com/ClusterHQ/flocker/issues/154).
 """
 
 from contextlib import contextmanager
-from io import BytesIO
+from tempfile import SpooledTemporaryFile
 
 from characteristic import with_cmp
 
@@ -31,6 +31,11 @@ from .filesystems.zfs import Snapshot
 # https://github.com/ClusterHQ/flocker/issues/390
 SSH_PRIVATE_KEY_PATH = FilePath(b"/etc/flocker/id_rsa_flocker")
 
+# Received volume data is buffered in memory up to this many bytes, after
+# which it spills to a temporary file so a large volume can't exhaust
+# memory.
+RECEIVE_SPOOL_SIZE = 1024 * 1024 * 10
+
 
 def standard_node(hostname):
     """
@@ -89,6 +94,9 @@ class RemoteVolumeManager(object):
     """
     ``INode``\-based communication with a remote volume manager.
     """
+    # Deployments create one of these per remote node operation; skip the
+    # per-instance ``__dict__``.
+    __slots__ = ("_destination", "_config_path", "_command_prefix")
 
     def __init__(self, destination, config_path=DEFAULT_CONFIG_PATH):
         """
@@ -98,6 +106,10 @@ class RemoteVolumeManager(object):
         """
         self._destination = destination
         self._config_path = config_path
+        # Every remote command starts with the same arguments; encode them
+        # once here instead of on every call.
+        self._command_prefix = [
+            b"flocker-volume", b"--config", config_path.path]
 
     def snapshots(self, volume):
         """
@@ -105,9 +117,8 @@ class RemoteVolumeManager(object):
         output into a ``list`` of ``Snapshot`` instances.
         """
         data = self._destination.get_output(
-            [b"flocker-volume",
-             b"--config", self._config_path.path,
-             b"snapshots",
+            self._command_prefix +
+            [b"snapshots",
              volume.uuid.encode("ascii"),
              volume.name.to_bytes()]
         )
@@ -118,18 +129,17 @@ class RemoteVolumeManager(object):
         ])
 
     def receive(self, volume):
-        return self._destination.run([b"flocker-volume",
-                                      b"--config", self._config_path.path,
-                                      b"receive",
-                                      volume.uuid.encode(b"ascii"),
-                                      volume.name.to_bytes()])
+        return self._destination.run(
+            self._command_prefix +
+            [b"receive",
+             volume.uuid.encode("ascii"),
+             volume.name.to_bytes()])
 
     def acquire(self, volume):
         return self._destination.get_output(
-            [b"flocker-volume",
-             b"--config", self._config_path.path,
-             b"acquire",
-             volume.uuid.encode(b"ascii"),
+            self._command_prefix +
+            [b"acquire",
+             volume.uuid.encode("ascii"),
              volume.name.to_bytes()]).decode("ascii")
 
 
@@ -153,10 +163,13 @@ class LocalVolumeManager(object):
 
     @contextmanager
     def receive(self, volume):
-        input_file = BytesIO()
-        yield input_file
-        input_file.seek(0, 0)
-        self._service.receive(volume.uuid, volume.name, input_file)
+        input_file = SpooledTemporaryFile(max_size=RECEIVE_SPOOL_SIZE)
+        try:
+            yield input_file
+            input_file.seek(0, 0)
+            self._service.receive(volume.uuid, volume.name, input_file)
+        finally:
+            input_file.close()
 
     def acquire(self, volume):
         self._service.acquire(volume.uuid, volume.name)
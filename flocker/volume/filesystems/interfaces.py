@@ -71,10 +71,14 @@ class IFilesystem(Interface):
         The returned file-like object will be closed by this object.
 
         :param remote_snapshots: An iterable of the snapshots which are
-            available on the writer, ordered from oldest to newest.  An
-            incremental data stream may be generated based on one of these if
-            possible.  If no value is passed then a complete data stream will
-            be generated.
+            available on the writer, ordered from oldest to newest, as
+            obtained from :meth:`IFilesystem.snapshots` on the writer's
+            filesystem.  Implementations must use the most recent snapshot
+            which also exists locally as the basis for an incremental data
+            stream, so that every push after the first transfers only the
+            changes since that snapshot.  If no value is passed, or no
+            common snapshot exists, a complete data stream is generated
+            instead.
 
         :return: A file-like object from whom the filesystem's data can be
             read as ``bytes``.
@@ -105,7 +109,14 @@ class IFilesystem(Interface):
         """True if and only if underlying OS filesystem is different."""
 
     def __hash__():
-        """Equal objects should have the same hash."""
+        """Equal objects should have the same hash.
+
+        These objects are used as ``dict`` and ``set`` keys in hot paths
+        (metadata mappings, already-seen sets in convergence loops), so the
+        hash must be O(1), must not perform any I/O and should be derived
+        from immutable identifiers captured at construction time (e.g. the
+        pool and dataset names), never from live filesystem state.
+        """
 
 
 class IStoragePool(Interface):
@@ -122,6 +133,22 @@ class IStoragePool(Interface):
             :class:`IFilesystem` provider, or errbacks if creation failed.
         """
 
+    def create_many(volumes):
+        """
+        Create new filesystems for all of the given volumes.
+
+        Implementations should run the individual creations concurrently
+        where the backend allows it, so that materializing a configuration
+        with many volumes does not pay one full round-trip per volume.
+
+        :param volumes: An iterable of volumes whose filesystems should be
+            created.
+
+        :return: Deferred that fires with a :class:`list` of
+            :class:`IFilesystem` providers in the same order as ``volumes``,
+            or errbacks if any creation failed.
+        """
+
     def clone_to(parent, volume):
         """
         Clone an existing volume to create a new one.
@@ -141,6 +168,13 @@ class IStoragePool(Interface):
 
         This presumes the volume exists.
 
+        This is called repeatedly for the same volumes by loops that ask
+        "does this volume exist / where is it mounted", so implementations
+        must compute the result purely from the volume's identity - no
+        subprocesses, no filesystem access.  Existence and other on-disk
+        state are the domain of ``enumerate`` and
+        ``enumerate_with_metadata``.
+
         :param Volume volume: The volume whose filesystem is being retrieved.
         :type volume: :class:`flocker.volume.service.Volume`
 
@@ -166,3 +200,20 @@ class IStoragePool(Interface):
         :return: A ``Deferred`` that fires with a :class:`list` of
             :class:`IFilesystem` providers.
         """
+
+    def enumerate_with_metadata(properties=()):
+        """Get a listing of all filesystems in this pool with their metadata.
+
+        Implementations must gather the requested properties for every
+        filesystem in one pass rather than interrogating each filesystem
+        individually - for ZFS that means a single ``zfs list`` invocation
+        for the whole pool instead of one child process per filesystem.
+
+        :param properties: An iterable of ``bytes``, the names of the
+            properties to retrieve for each filesystem.
+
+        :return: A ``Deferred`` that fires with a :class:`dict` mapping
+            :class:`IFilesystem` providers to ``dict``\ s mapping each
+            requested property name to its ``bytes`` value.  Properties an
+            implementation does not know about get the value ``b"-"``.
+        """
@@ -13,7 +13,7 @@ from zope.interface import implementer
 
 from characteristic import attributes
 
-from twisted.internet.defer import succeed, fail
+from twisted.internet.defer import succeed, fail, gatherResults
 from twisted.application.service import Service
 
 from .interfaces import (
@@ -156,6 +156,9 @@ class FilesystemStoragePool(Service):
         filesystem.get_path().makedirs()
         return succeed(filesystem)
 
+    def create_many(self, volumes):
+        return gatherResults([self.create(volume) for volume in volumes])
+
     def clone_to(self, parent, volume):
         parent = self.get(parent)
         child = self.get(volume)
@@ -193,3 +196,16 @@ class FilesystemStoragePool(Service):
                 DirectoryFilesystem(path=path)
                 for path in self._root.children()})
         return succeed(set())
+
+    def enumerate_with_metadata(self, properties=()):
+        def metadata(filesystem):
+            known = {b"mountpoint": filesystem.get_path().path}
+            return dict(
+                (name, known.get(name, b"-")) for name in properties)
+        if self._root.isdir():
+            return succeed(dict(
+                (filesystem, metadata(filesystem))
+                for filesystem in (
+                    DirectoryFilesystem(path=path)
+                    for path in self._root.children())))
+        return succeed({})
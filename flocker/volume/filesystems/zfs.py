@@ -22,7 +22,7 @@ from eliot import Field, MessageType, Logger
 from twisted.python.filepath import FilePath
 from twisted.internet.endpoints import ProcessEndpoint, connectProtocol
 from twisted.internet.protocol import Protocol
-from twisted.internet.defer import Deferred, succeed
+from twisted.internet.defer import Deferred, succeed, gatherResults
 from twisted.internet.error import ConnectionDone, ProcessTerminated
 from twisted.application.service import Service
 
@@ -355,8 +355,10 @@ def _list_snapshots_command(filesystem):
         b"list",
         # Format the output without a header.
         b"-H",
-        # Recurse to datasets beneath the named dataset.
-        b"-r",
+        # Only look at the named dataset's own snapshots.  Descendant
+        # datasets' snapshots would be filtered back out during parsing, so
+        # recursing to them just makes zfs enumerate metadata we throw away.
+        b"-d", b"1",
         # Only output datasets of type snapshot.
         b"-t", b"snapshot",
         # Only output the name of each dataset encountered.  The name is the
@@ -491,6 +493,12 @@ class StoragePool(Service):
         d.addCallback(lambda _: filesystem)
         return d
 
+    def create_many(self, volumes):
+        # Each dataset needs its own mountpoint property so there is one
+        # zfs create per volume, but they are all launched at once and run
+        # concurrently rather than waiting for each other.
+        return gatherResults([self.create(volume) for volume in volumes])
+
     def clone_to(self, parent, volume):
         parent_filesystem = self.get(parent)
         new_filesystem = self.get(volume)
@@ -574,7 +582,7 @@ class StoragePool(Service):
         def listed(filesystems):
             result = set()
             for entry in filesystems:
-                dataset, mountpoint = entry
+                dataset, mountpoint = entry[:2]
                 filesystem = Filesystem(
                     self._name, dataset, FilePath(mountpoint))
                 result.add(filesystem)
@@ -582,30 +590,50 @@ class StoragePool(Service):
 
         return listing.addCallback(listed)
 
+    def enumerate_with_metadata(self, properties=()):
+        properties = list(properties)
+        listing = _list_filesystems(self._reactor, self._name, properties)
+
+        def listed(filesystems):
+            result = {}
+            for entry in filesystems:
+                dataset, mountpoint = entry[:2]
+                filesystem = Filesystem(
+                    self._name, dataset, FilePath(mountpoint))
+                result[filesystem] = dict(zip(properties, entry[2:]))
+            return result
+
+        return listing.addCallback(listed)
+
 
-def _list_filesystems(reactor, pool):
+def _list_filesystems(reactor, pool, properties=()):
     """Get a listing of all filesystems on a given pool.
 
     :param pool: A `flocker.volume.filesystems.interface.IStoragePool`
         provider.
+    :param properties: An iterable of ``bytes``, names of additional
+        properties to retrieve for each filesystem.
     :return: A ``Deferred`` that fires with an iterator, the elements
         of which are ``tuples`` containing the name and mountpoint of each
-        filesystem.
+        filesystem, followed by the values of any additional properties
+        requested.
     """
     # ZFS list command with a depth of 1, so that only this dataset and its
     # direct children are shown.
     # No headers are printed.
-    # name and mountpoint are the properties displayed.
+    # name and mountpoint are the properties displayed, along with any
+    # extras the caller asked for - all retrieved by this one command.
+    fields = [b"name", b"mountpoint"] + list(properties)
     listing = zfs_command(
         reactor,
-        [b"list", b"-d", b"1", b"-H", b"-o", b"name,mountpoint", pool])
+        [b"list", b"-d", b"1", b"-H", b"-o", b",".join(fields), pool])
 
     def listed(output, pool):
         for line in output.splitlines():
-            name, mountpoint = line.split(b'\t')
-            name = name[len(pool) + 1:]
+            values = line.split(b'\t')
+            name = values[0][len(pool) + 1:]
             if name:
-                yield (name, mountpoint)
+                yield tuple([name] + values[1:])
 
     listing.addCallback(listed, pool)
     return listing
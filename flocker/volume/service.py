@@ -120,7 +120,8 @@ class VolumeService(Service):
                                                          u"version": 1}))
         except OSError as e:
             raise CreateConfigurationError(e.args[1])
-        config = json.loads(self._config_path.getContent())
+        with self._config_path.open() as config_file:
+            config = json.load(config_file)
         self.uuid = config[u"uuid"]
         self.pool.startService()
 
@@ -246,6 +246,43 @@ def make_istoragepool_tests(fixture):
             d.addCallback(created_filesystems)
             return d
 
+        def test_create_many_filesystems(self):
+            """
+            ``create_many()`` returns a ``list`` of :class:`IFilesystem`
+            providers in the same order as the given volumes.
+            """
+            pool = fixture(self)
+            service = service_for_pool(self, pool)
+            volume = service.get(MY_VOLUME)
+            volume2 = service.get(MY_VOLUME2)
+            d = pool.create_many([volume, volume2])
+
+            def created_filesystems(filesystems):
+                self.assertEqual(
+                    [volume.get_filesystem(), volume2.get_filesystem()],
+                    filesystems)
+            d.addCallback(created_filesystems)
+            return d
+
+        def test_create_many_mountpoints(self):
+            """
+            The filesystems created by ``create_many()`` have mountpoints
+            which are directories.
+            """
+            pool = fixture(self)
+            service = service_for_pool(self, pool)
+            volume = service.get(MY_VOLUME)
+            volume2 = service.get(MY_VOLUME2)
+            d = pool.create_many([volume, volume2])
+
+            def created_filesystems(filesystems):
+                self.assertEqual(
+                    [True, True],
+                    [filesystem.get_path().isdir()
+                     for filesystem in filesystems])
+            d.addCallback(created_filesystems)
+            return d
+
         def test_get_filesystem(self):
             """
             ``get()`` returns the same :class:`IFilesystem` provider as the
@@ -550,6 +587,58 @@ def make_istoragepool_tests(fixture):
                 self.assertEqual(expected, result)
             return enumerating.addCallback(enumerated)
 
+        def test_enumerate_with_metadata_no_filesystems(self):
+            """
+            Lacking any filesystems, ``enumerate_with_metadata()`` returns an
+            empty result.
+            """
+            pool = fixture(self)
+            enumerating = pool.enumerate_with_metadata()
+            enumerating.addCallback(self.assertEqual, {})
+            return enumerating
+
+        def test_enumerate_with_metadata_same_filesystems(self):
+            """
+            ``enumerate_with_metadata()`` covers the same filesystems as
+            ``enumerate()``.
+            """
+            pool = fixture(self)
+            service = service_for_pool(self, pool)
+            volume = service.get(MY_VOLUME)
+            volume2 = service.get(MY_VOLUME2)
+            creating = gatherResults([
+                pool.create(volume), pool.create(volume2)])
+
+            def created(ignored):
+                return pool.enumerate_with_metadata()
+            enumerating = creating.addCallback(created)
+
+            def enumerated(result):
+                expected = {volume.get_filesystem(), volume2.get_filesystem()}
+                self.assertEqual(expected, set(result))
+            return enumerating.addCallback(enumerated)
+
+        def test_enumerate_with_metadata_mountpoint(self):
+            """
+            The metadata returned by ``enumerate_with_metadata()`` includes
+            requested properties, such as each filesystem's mountpoint.
+            """
+            pool = fixture(self)
+            service = service_for_pool(self, pool)
+            volume = service.get(MY_VOLUME)
+            creating = pool.create(volume)
+
+            def created(ignored):
+                return pool.enumerate_with_metadata([b"mountpoint"])
+            enumerating = creating.addCallback(created)
+
+            def enumerated(result):
+                filesystem = volume.get_filesystem()
+                self.assertEqual(
+                    {filesystem: {b"mountpoint": filesystem.get_path().path}},
+                    result)
+            return enumerating.addCallback(enumerated)
+
         def test_consistent_naming_pattern(self):
             """
             ``IFilesystem.get_path().basename()`` has a consistent naming
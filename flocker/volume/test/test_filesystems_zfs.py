@@ -216,8 +216,9 @@ class ZFSSnapshotsTests(SynchronousTestCase):
         snapshots = ZFSSnapshots(reactor, Filesystem(b"mypool", None))
         snapshots.list()
         self.assertEqual(reactor.processes[0].args,
-                         [b"zfs", b"list", b"-H", b"-r", b"-t", b"snapshot",
-                          b"-o", b"name", b"-s", b"creation", b"mypool"])
+                         [b"zfs", b"list", b"-H", b"-d", b"1",
+                          b"-t", b"snapshot", b"-o", b"name",
+                          b"-s", b"creation", b"mypool"])
 
     def test_list_result_root_dataset(self):
         """